@@ -1,24 +1,81 @@
-from fastapi import FastAPI
+import os
+
+# Pin NumPy's BLAS to one thread per worker: it reads these once, when NumPy
+# is first imported, so this stays above every import. A sub-millisecond MLP
+# gains nothing from thread pools, they only add wake-up latency; scale with
+# WEB_CONCURRENCY instead. Env overrides win. TensorFlow's own thread pools are
+# left alone: serving never imports it, and /train-landmarks should use every core.
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+for _threads_var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_threads_var, "1")
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import time
 import logging
-import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
+import msgspec
 from pydantic import BaseModel
 
 # Try to import landmark model, return error if unavailable
 try:
-    from landmark_model import asl_model
+    from landmark_runtime import ASLLandmarkRuntime
     LANDMARK_MODEL_AVAILABLE = True
 except ImportError as e:
     print(f"❌ Landmark model not available: {e}")
     LANDMARK_MODEL_AVAILABLE = False
 
+MODEL_PATH = "models/asl_landmark_model"
+
+def load_startup_model(model, model_path):
+    """Try to load an existing model when the server starts"""
+    print(f"🔍 Looking for model files at: {model_path}")
+    print(f"📁 Current working directory: {os.getcwd()}")
+    print(f"📁 Directory contents: {os.listdir('.')}")
+    
+    if os.path.exists("models"):
+        print(f"📁 Models directory contents: {os.listdir('models')}")
+    else:
+        print("❌ Models directory does not exist!")
+    
+    if (os.path.exists(f"{model_path}_weights.npz") or os.path.exists(f"{model_path}_model.keras")
+            or os.path.exists(f"{model_path}_model.h5")):
+        print("🔄 Attempting to load model...")
+        if model.load_model(model_path):
+            print("✅ Pre-trained model loaded successfully")
+        else:
+            print("❌ Failed to load pre-trained model. Will need retraining.")
+    else:
+        print("ℹ️ No pre-trained model found. Model will be trained on first request.")
+
+# Initialize global model instance (here, not in landmark_runtime, so importing
+# the model modules, e.g. from retrain_model.py, loads nothing)
+if LANDMARK_MODEL_AVAILABLE:
+    asl_model = ASLLandmarkRuntime()
+    load_startup_model(asl_model, MODEL_PATH)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="ASL Landmark Inference API")
+# orjson for every response, including the error dicts and /health, /train-landmarks
+app = FastAPI(title="ASL Landmark Inference API", default_response_class=ORJSONResponse)
+
+# Micro-batching: concurrent predictions arriving within BATCH_TIMEOUT_MS are
+# coalesced into one model call of at most MAX_BATCH_SIZE samples
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 32))
+BATCH_TIMEOUT_MS = float(os.getenv("BATCH_TIMEOUT_MS", 5))
+# Largest /predict-landmarks/batch request; the inference thread's buffers grow
+# to the biggest batch seen and are kept, so this bounds their memory
+MAX_REQUEST_BATCH_SIZE = int(os.getenv("MAX_REQUEST_BATCH_SIZE", 256))
+
+# Model calls run here so they never block the event loop; one thread per
+# worker process keeps inference serialized while request parsing overlaps
+_inference_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
 
 # Add CORS middleware to allow frontend connections
 app.add_middleware(
@@ -29,13 +86,105 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Pydantic models for landmark prediction
-class LandmarkPredictionRequest(BaseModel):
+# Hot-path request body, decoded straight from JSON bytes by msgspec
+class LandmarkPredictionRequest(msgspec.Struct):
     landmarks: List[List[float]]  # [[x,y,z], [x,y,z], ...]
 
+class LandmarkBatchPredictionRequest(msgspec.Struct):
+    landmarks_batch: List[List[List[float]]]  # one [[x,y,z], ...] entry per hand
+
+landmark_request_decoder = msgspec.json.Decoder(LandmarkPredictionRequest)
+landmark_batch_request_decoder = msgspec.json.Decoder(LandmarkBatchPredictionRequest)
+
+# /predict-landmarks/bin body: 21 landmarks x (x, y, z) as little-endian float32
+LANDMARK_SHAPE = (21, 3)
+LANDMARK_DTYPE = np.dtype("<f4")
+LANDMARKS_BINARY_SIZE = LANDMARK_SHAPE[0] * LANDMARK_SHAPE[1] * LANDMARK_DTYPE.itemsize
+
+# Pydantic models for training
 class TrainingRequest(BaseModel):
     data_directory: str
 
+class PredictionBatcher:
+    """Coalesces concurrent landmark predictions into single batched model calls"""
+    
+    def __init__(self, max_batch_size, timeout_ms):
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout_ms / 1000
+        self.queue = None
+        self._task = None
+    
+    def start(self):
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._process_loop())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def predict(self, landmarks, debug=True):
+        """Queue one sample and wait for its slice of the batched result"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((landmarks, debug, future))
+        return await future
+    
+    async def _collect_batch(self):
+        # Block for the first request, then gather more until the window closes
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _process_loop(self):
+        while True:
+            batch = await self._collect_batch()
+            
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    _inference_pool,
+                    asl_model.predict_batch,
+                    [landmarks for landmarks, _, _ in batch],
+                    [debug for _, debug, _ in batch]
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, _, future), result in zip(batch, results):
+                # Skip requests whose client went away while queued
+                if not future.done():
+                    future.set_result(result)
+
+batcher = PredictionBatcher(MAX_BATCH_SIZE, BATCH_TIMEOUT_MS)
+
+@app.on_event("startup")
+async def start_batcher():
+    if LANDMARK_MODEL_AVAILABLE:
+        # Warm up on the inference thread itself, since its buffers are thread-local
+        await asyncio.get_running_loop().run_in_executor(_inference_pool, asl_model.warm_up, MAX_BATCH_SIZE)
+        batcher.start()
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -51,8 +200,32 @@ async def health_check():
     }
 
 @app.post("/predict-landmarks")
-async def predict_landmarks(request: LandmarkPredictionRequest):
-    """Predict ASL letter from MediaPipe landmarks"""
+async def predict_landmarks(raw_request: Request, debug: bool = True):
+    """Predict ASL letter from MediaPipe landmarks (?debug=0 skips top_predictions)"""
+    try:
+        request = landmark_request_decoder.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {e}")
+    
+    return await _predict_single(request.landmarks, debug)
+
+@app.post("/predict-landmarks/bin")
+async def predict_landmarks_binary(raw_request: Request, debug: bool = True):
+    """Predict from a raw body of 21 x (x, y, z) little-endian float32 (252 bytes), no JSON parsing"""
+    body = await raw_request.body()
+    if len(body) != LANDMARKS_BINARY_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Expected {LANDMARKS_BINARY_SIZE} bytes (21 x 3 float32), got {len(body)}"
+        )
+    landmarks = np.frombuffer(body, dtype=LANDMARK_DTYPE).reshape(LANDMARK_SHAPE)
+    if not np.isfinite(landmarks).all():
+        raise HTTPException(status_code=422, detail="Landmark coordinates must be finite numbers")
+    
+    return await _predict_single(landmarks, debug)
+
+async def _predict_single(landmarks, debug):
+    """Shared body of the JSON and binary single-hand prediction endpoints"""
     try:
         start_time = time.time()
         
@@ -73,20 +246,21 @@ async def predict_landmarks(request: LandmarkPredictionRequest):
             }
         
         # Validate landmarks
-        if len(request.landmarks) != 21:
+        if len(landmarks) != 21:
             return {
                 "prediction": None,
                 "confidence": 0.0,
-                "error": f"Expected 21 landmarks, got {len(request.landmarks)}"
+                "error": f"Expected 21 landmarks, got {len(landmarks)}"
             }
         
-        # Use real model for prediction
-        result = asl_model.predict(request.landmarks)
+        # Use real model for prediction (batched with concurrent requests)
+        result = await batcher.predict(landmarks, debug)
         
         processing_time = time.time() - start_time
         result["processing_time"] = processing_time
         
-        return result
+        # Serialize with orjson directly, skipping FastAPI's jsonable_encoder pass
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error(f"Landmark prediction failed: {str(e)}")
@@ -96,6 +270,79 @@ async def predict_landmarks(request: LandmarkPredictionRequest):
             "error": f"Prediction failed: {str(e)}"
         }
 
+@app.post("/predict-landmarks/batch")
+async def predict_landmarks_batch(raw_request: Request, debug: bool = True):
+    """Predict ASL letters for many hands with one vectorized model call"""
+    try:
+        request = landmark_batch_request_decoder.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {e}")
+    
+    if len(request.landmarks_batch) > MAX_REQUEST_BATCH_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_REQUEST_BATCH_SIZE} hands per batch, got {len(request.landmarks_batch)}"
+        )
+    
+    try:
+        start_time = time.time()
+        
+        if not LANDMARK_MODEL_AVAILABLE:
+            return {
+                "predictions": [],
+                "error": "Landmark model dependencies not available. Please install required packages."
+            }
+        
+        if not asl_model.is_trained:
+            return {
+                "predictions": [],
+                "error": "Model not trained. Please train the model first using /train-landmarks endpoint."
+            }
+        
+        # Already a batch, so skip the coalescing queue and run it directly
+        predictions = await asyncio.get_running_loop().run_in_executor(
+            _inference_pool,
+            asl_model.predict_batch,
+            request.landmarks_batch,
+            debug
+        )
+        
+        return ORJSONResponse({
+            "predictions": predictions,
+            "total_processed": len(predictions),
+            "processing_time": time.time() - start_time
+        })
+        
+    except Exception as e:
+        logger.error(f"Batch landmark prediction failed: {str(e)}")
+        return {
+            "predictions": [],
+            "error": f"Batch prediction failed: {str(e)}"
+        }
+
+def _train_and_save(data_directory, model_path):
+    """Train a fresh model and save it; blocking, so callers run it off the event loop"""
+    # TensorFlow is only imported when training, not by every serving worker
+    from landmark_training import ASLLandmarkModel
+    trainer = ASLLandmarkModel()
+    
+    # Train the model
+    results = trainer.train(data_directory)
+    
+    # Save the trained model
+    trainer.save_model(model_path)
+    return results
+
+def _reload_model(model_path):
+    """Serve a newly saved model; runs on _inference_pool, so never mid-prediction"""
+    if not asl_model.load_model(model_path):
+        return False
+    asl_model.warm_up(MAX_BATCH_SIZE)
+    return True
+
+# Training writes the shared model files; one run at a time
+_training_lock = asyncio.Lock()
+
 @app.post("/train-landmarks")
 async def train_landmarks(request: TrainingRequest):
     """Train landmark-based ASL model"""
@@ -106,14 +353,25 @@ async def train_landmarks(request: TrainingRequest):
                 "error": "Landmark model dependencies not available. Please install required packages."
             }
         
-        logger.info(f"Starting model training with data from: {request.data_directory}")
+        if _training_lock.locked():
+            raise HTTPException(status_code=409, detail="Model training already in progress")
         
-        # Train the model
-        results = asl_model.train(request.data_directory)
+        async with _training_lock:
+            logger.info(f"Starting model training with data from: {request.data_directory}")
+            
+            model_path = MODEL_PATH
+            
+            # Training takes minutes; run it in a thread so the event loop keeps serving predictions
+            results = await asyncio.to_thread(_train_and_save, request.data_directory, model_path)
+            
+            # Serve the new folded weights
+            loaded = await asyncio.get_running_loop().run_in_executor(_inference_pool, _reload_model, model_path)
         
-        # Save the trained model
-        model_path = "models/asl_landmark_model"
-        asl_model.save_model(model_path)
+        if not loaded:
+            return {
+                "success": False,
+                "error": f"Model trained but could not be loaded from {model_path}"
+            }
         
         logger.info("Model training completed successfully")
         
@@ -124,6 +382,8 @@ async def train_landmarks(request: TrainingRequest):
             "model_path": model_path
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Training failed: {str(e)}")
         return {
@@ -145,11 +405,17 @@ if __name__ == "__main__":
         logger.info("❌ Model dependencies not available. Please install required packages.")
     
     port = int(os.getenv("PORT", 8001))
+    # Auto-reload only in development. /train-landmarks only reloads the worker
+    # that served it, so run one worker by default; with WEB_CONCURRENCY > 1,
+    # restart the service after training so every worker serves the new model.
+    dev_mode = os.getenv("DEV") == "1"
+    workers = None if dev_mode else int(os.getenv("WEB_CONCURRENCY", 1))
     print(f"🔌 Starting AI service on port: {port}")
     uvicorn.run(
         "inference_server:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        reload=dev_mode,
+        workers=workers,
         log_level="info"
     ) 
\ No newline at end of file
@@ -0,0 +1,317 @@
+import numpy as np
+import math
+import os
+import threading
+from collections import OrderedDict
+
+# Set ASL_DEBUG=1 to include normalization details in every prediction
+ASL_DEBUG = bool(os.getenv("ASL_DEBUG"))
+
+class ASLLandmarkRuntime:
+    """Inference-only ASL landmark model: folded MLP weights + NumPy, no TensorFlow"""
+    # LRU of recent predictions keyed on features quantized to 1/64 std dev
+    CACHE_SIZE = 1024
+    CACHE_QUANTIZATION = 64
+
+    def __init__(self):
+        self.is_trained = False
+        self._classes = None
+        self._mean = None
+        self._inv_scale = None
+        self._cache_scale = None
+        # Everything predictions read: (infer, classes, cache_scale, prediction cache)
+        self._state = None
+        self._local = threading.local()  # per-thread preprocessing buffers
+        self._cache_lock = threading.Lock()
+
+    def normalize_hand_pose(self, landmarks):
+        """Normalize hand pose to be more robust"""
+        return self.normalize_hand_poses(np.asarray(landmarks, dtype=np.float32).reshape(1, 63))[0]
+
+    def normalize_hand_poses(self, X):
+        """Normalize a (N, 63) batch of hand poses in one vectorized pass"""
+        landmarks = np.array(X, dtype=np.float32).reshape(-1, 21, 3)
+
+        # Translate so wrist (index 0) is at origin
+        landmarks -= landmarks[:, 0:1, :]
+
+        # Scale by hand size (distance from wrist to middle finger tip, index 12)
+        hand_size = np.linalg.norm(landmarks[:, 12, :], axis=1)[:, None, None]
+        np.divide(landmarks, np.where(hand_size > 0, hand_size, 1.0), out=landmarks)
+
+        # Flatten back to 63 features
+        return landmarks.reshape(-1, 63)
+
+    def _set_preprocessing(self, mean, scale, classes):
+        """Cache the scaler constants and class labels used at inference"""
+        self._classes = np.asarray(classes)
+        self._mean = np.asarray(mean, dtype=np.float32)
+        self._inv_scale = (1.0 / np.asarray(scale)).astype(np.float32)
+        self._cache_scale = self._inv_scale * np.float32(self.CACHE_QUANTIZATION)
+
+    def _publish(self, infer):
+        """Make a model live for predictions with a single assignment.
+
+        A batch already running keeps the state it started with, so it can't
+        mix old outputs with new class labels or fill the new model's cache.
+        """
+        self._state = (infer, self._classes, self._cache_scale, OrderedDict())
+        self.is_trained = True
+
+    def _publish_dense_layers(self, dense_layers):
+        """Publish folded (W, b, activation) layers served by _numpy_forward"""
+        self._publish(lambda X: self._numpy_forward(X, dense_layers))
+
+    def _get_activation_buffers(self, rows, dense_layers):
+        """Preallocated per-layer output buffers for this thread, like ORT I/O binding"""
+        buffers = getattr(self._local, "activations", None)
+        if (buffers is None or buffers[0].shape[0] < rows
+                or self._local.activations_for is not dense_layers):
+            capacity = max(rows, 32)
+            buffers = [np.empty((capacity, W.shape[1]), dtype=np.float32) for W, _, _ in dense_layers]
+            self._local.activations = buffers
+            self._local.activations_for = dense_layers
+        return [buf[:rows] for buf in buffers]
+
+    def _numpy_forward(self, X, dense_layers):
+        """Forward pass of the folded MLP: a few small GEMMs, no TensorFlow dispatch.
+
+        The returned array is a view into a reused per-thread buffer and is only
+        valid until the next call on the same thread.
+        """
+        h = X
+        for (W, b, activation), out in zip(dense_layers, self._get_activation_buffers(len(X), dense_layers)):
+            np.dot(h, W, out=out)
+            out += b
+            if activation == "relu":
+                np.maximum(out, 0, out=out)
+            h = out
+
+        # Numerically stable softmax on the output logits
+        h -= h.max(axis=1, keepdims=True)
+        np.exp(h, out=h)
+        h /= h.sum(axis=1, keepdims=True)
+        return h
+
+    def _fill_features(self, landmarks, row):
+        """Write normalized landmarks into a 63-float row in place, return hand size"""
+        if len(landmarks) != 21:
+            raise ValueError(f"Expected 21 landmarks, got {len(landmarks)}")
+
+        if isinstance(landmarks[0], dict):
+            # Format: [{"x": 0.1, "y": 0.2, "z": 0.3}, ...]
+            row[0::3] = [landmark["x"] for landmark in landmarks]
+            row[1::3] = [landmark["y"] for landmark in landmarks]
+            row[2::3] = [landmark["z"] for landmark in landmarks]
+        else:
+            # Format: [[x, y, z], ...] or a (21, 3) array, copied in one go.
+            # Check the shape first: the copy would broadcast e.g. [[v]] * 21.
+            shape = np.shape(landmarks)
+            if shape != (21, 3):
+                raise ValueError(f"Expected 21 landmarks of [x, y, z], got shape {shape}")
+            row.reshape(21, 3)[:] = landmarks
+
+        # NaN/inf would give a garbage prediction and an all-zero cache key
+        if not np.isfinite(row).all():
+            raise ValueError("Landmark coordinates must be finite numbers")
+
+        # Same normalization as normalize_hand_pose (CRITICAL FOR ACCURACY):
+        # translate wrist to origin, scale by wrist -> middle finger tip distance
+        wrist_x, wrist_y, wrist_z = float(row[0]), float(row[1]), float(row[2])
+        row[0::3] -= wrist_x
+        row[1::3] -= wrist_y
+        row[2::3] -= wrist_z
+
+        hand_size = math.sqrt(float(row[36]) ** 2 + float(row[37]) ** 2 + float(row[38]) ** 2)
+        if hand_size > 0:
+            row /= hand_size
+
+        return hand_size
+
+    def _get_buffer(self, rows):
+        """Reusable float32 input buffer with at least `rows` rows for this thread"""
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < rows:
+            buf = np.empty((rows, 63), dtype=np.float32)
+            self._local.buf = buf
+        return buf[:rows]
+
+    def _top_predictions(self, probabilities):
+        """Top-3 (class indices, confidences), best first, via O(N) argpartition"""
+        k = min(3, len(probabilities))
+        top_indices = np.argpartition(probabilities, -k)[-k:]
+        top_indices = top_indices[np.argsort(-probabilities[top_indices])]
+        return top_indices, probabilities[top_indices].tolist()
+
+    def _format_prediction(self, classes, top_indices, top_confidences, hand_size, debug=True):
+        """Build the response dict from the top predictions of one sample"""
+        confidence = top_confidences[0]
+
+        # Top 3 predictions help debug confusing letters; skipped unless asked for
+        if debug:
+            top_3_predictions = [
+                {"letter": str(classes[idx]), "confidence": conf}
+                for idx, conf in zip(top_indices, top_confidences)
+            ]
+
+        # Apply confidence threshold
+        if confidence < 0.5:
+            result = {
+                "prediction": "?",
+                "confidence": confidence,
+                "note": "Low confidence prediction"
+            }
+            if debug:
+                result["top_predictions"] = top_3_predictions
+            return result
+
+        # Decode label
+        result = {
+            "prediction": str(classes[top_indices[0]]),
+            "confidence": confidence
+        }
+        if debug:
+            result["top_predictions"] = top_3_predictions  # Added for debugging
+        if ASL_DEBUG:
+            result["debug_info"] = {
+                "features_normalized": True,
+                "hand_size": hand_size
+            }
+        return result
+
+    def _cache_keys(self, X, cache_scale):
+        """Quantize features in scaler units so near-identical hands share a cache key"""
+        quantized = np.clip(np.rint(X * cache_scale), -32768, 32767).astype(np.int16)
+        return [row.tobytes() for row in quantized]
+
+    def _cache_get(self, cache, key):
+        with self._cache_lock:
+            top = cache.get(key)
+            if top is not None:
+                cache.move_to_end(key)
+            return top
+
+    def _cache_put(self, cache, key, top):
+        with self._cache_lock:
+            cache[key] = top
+            cache.move_to_end(key)
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop cached predictions of the live model (a newly published one starts empty)"""
+        state = self._state
+        if state is not None:
+            with self._cache_lock:
+                state[3].clear()
+
+    def warm_up(self, rows=1):
+        """Run one throwaway forward pass on the calling thread.
+
+        Allocates that thread's input/activation buffers for `rows` samples and
+        pages in the weights and BLAS kernels, so the first real request doesn't
+        pay for it. Bypasses the prediction cache.
+        """
+        state = self._state
+        if state is None:
+            return
+        X = self._get_buffer(rows)
+        X.fill(0.0)
+        state[0](X)
+
+    def predict(self, landmarks, debug=True):
+        """Predict ASL letter from landmarks - optimized for speed"""
+        return self.predict_batch([landmarks], debug=debug)[0]
+
+    def predict_batch(self, landmarks_batch, debug=True):
+        """Predict ASL letters for several hands with a single model call.
+
+        `debug` is one flag for the whole batch or one flag per sample.
+        """
+        # One read of the live model for the whole batch, even if a reload swaps it meanwhile
+        state = self._state
+        if state is None:
+            return [{"prediction": "?", "confidence": 0.0, "error": "Model not trained"} for _ in landmarks_batch]
+        infer, classes, cache_scale, cache = state
+
+        results = [None] * len(landmarks_batch)
+        debug_flags = debug if isinstance(debug, (list, tuple)) else [debug] * len(landmarks_batch)
+        valid_indices = []
+        hand_sizes = []
+        buf = self._get_buffer(len(landmarks_batch))
+
+        for i, landmarks in enumerate(landmarks_batch):
+            try:
+                # Valid rows are packed to the front of the buffer
+                hand_sizes.append(self._fill_features(landmarks, buf[len(valid_indices)]))
+                valid_indices.append(i)
+            except Exception as e:
+                results[i] = {"prediction": "?", "confidence": 0.0, "error": str(e)}
+
+        if not valid_indices:
+            return results
+
+        try:
+            # No separate scaling step: StandardScaler is folded into the first layer
+            X = buf[:len(valid_indices)]
+
+            # Held signs produce near-identical frames; serve those from the cache
+            cache_keys = self._cache_keys(X, cache_scale)
+            miss_rows = []
+            for row, (i, key) in enumerate(zip(valid_indices, cache_keys)):
+                top = self._cache_get(cache, key)
+                if top is not None:
+                    results[i] = self._format_prediction(classes, *top, hand_sizes[row], debug_flags[i])
+                else:
+                    miss_rows.append(row)
+
+            if miss_rows:
+                # One forward pass for all cache misses
+                predictions = infer(X if len(miss_rows) == len(X) else X[miss_rows])
+
+                for row, probabilities in zip(miss_rows, predictions):
+                    top = self._top_predictions(probabilities)
+                    self._cache_put(cache, cache_keys[row], top)
+                    i = valid_indices[row]
+                    results[i] = self._format_prediction(classes, *top, hand_sizes[row], debug_flags[i])
+
+        except Exception as e:
+            for i in valid_indices:
+                results[i] = {"prediction": "?", "confidence": 0.0, "error": str(e)}
+
+        return results
+
+    def load_model(self, filepath):
+        """Load folded weights and preprocessing constants.
+
+        On failure the model already being served, if any, stays live.
+        """
+        try:
+            if not (os.path.exists(f"{filepath}_weights.npz") and os.path.exists(f"{filepath}_pp.npz")):
+                # Only a Keras model on disk: fold and export it once, paying for TensorFlow here
+                print("Folded weights not found, exporting them from the Keras model")
+                from landmark_training import ASLLandmarkModel
+                trainer = ASLLandmarkModel()
+                if not trainer.load_model(filepath):
+                    return False
+                trainer.export_inference(filepath)
+
+            with np.load(f"{filepath}_pp.npz", allow_pickle=False) as arrays:
+                mean = arrays["mean"]
+                scale = arrays["scale"]
+                classes = arrays["classes"]
+
+            with np.load(f"{filepath}_weights.npz", allow_pickle=False) as arrays:
+                dense_layers = [
+                    (arrays[f"W{i}"], arrays[f"b{i}"], str(activation))
+                    for i, activation in enumerate(arrays["activations"])
+                ]
+
+            self._set_preprocessing(mean, scale, classes)
+            self._publish_dense_layers(dense_layers)
+            print(f"Model loaded from {filepath}")
+            return True
+
+        except Exception as e:
+            print(f"Failed to load model: {e}")
+            return False
@@ -0,0 +1,412 @@
+import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+import orjson
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.metrics import accuracy_score
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import Dense, Dropout, BatchNormalization
+from tensorflow.keras.optimizers import Adam
+from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
+import pickle
+from landmark_runtime import ASLLandmarkRuntime
+
+# Per-letter append-only sample log written by the backend's /collect-sample;
+# must match SAMPLE_LOG_NAME / SAMPLE_DTYPE in apps/backend/main.py
+SAMPLE_LOG_NAME = "samples.bin"
+SAMPLE_DTYPE = np.dtype([
+    ("sample_id", "S36"),
+    ("timestamp", "<i8"),
+    ("landmarks", "<f4", (21, 3)),
+])
+
+class ASLLandmarkModel(ASLLandmarkRuntime):
+    """Training side of the landmark model; servers only import landmark_runtime"""
+    
+    def __init__(self):
+        super().__init__()
+        self.model = None
+        self.label_encoder = None
+        self.scaler = None
+        
+    @staticmethod
+    def _load_sample(sample_file):
+        """Parse one sample file into a 63-float vector, or None if it's invalid"""
+        try:
+            sample = orjson.loads(sample_file.read_bytes())
+            
+            # Extract landmarks as flat array
+            landmarks = sample["landmarks"]
+            if len(landmarks) != 21:  # 21 landmarks * 3 coords
+                print(f"Invalid sample: {sample_file} (expected 63 features, got {len(landmarks) * 3})")
+                return None
+            
+            return np.fromiter(
+                chain.from_iterable((landmark["x"], landmark["y"], landmark["z"]) for landmark in landmarks),
+                dtype=np.float32,
+                count=63
+            )
+            
+        except Exception as e:
+            print(f"Error loading {sample_file}: {e}")
+            return None
+    
+    def load_dataset(self, data_directory):
+        """Load landmark data from per-letter sample logs and legacy JSON files"""
+        sample_files = []
+        file_labels = []
+        log_features = []
+        log_labels = []
+        
+        data_path = Path(data_directory)
+        print(f"Loading data from: {data_path}")
+        
+        for letter_dir in data_path.iterdir():
+            if letter_dir.is_dir():
+                letter = letter_dir.name
+                print(f"Loading samples for letter: {letter}")
+                
+                # Binary log: one read, the landmarks are already float32
+                log_path = letter_dir / SAMPLE_LOG_NAME
+                if log_path.exists():
+                    data = log_path.read_bytes()
+                    records = np.frombuffer(data, dtype=SAMPLE_DTYPE, count=len(data) // SAMPLE_DTYPE.itemsize)
+                    log_features.append(records["landmarks"].reshape(-1, 63))
+                    log_labels.extend([letter] * len(records))
+                
+                letter_files = list(letter_dir.glob("*.json"))
+                sample_files.extend(letter_files)
+                file_labels.extend([letter] * len(letter_files))
+        
+        # Reading + parsing is I/O and C-parser bound, so threads overlap well
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            vectors = list(executor.map(self._load_sample, sample_files))
+        
+        # float32 end to end: it's what Keras and the NumPy forward pass consume
+        valid = [i for i, vector in enumerate(vectors) if vector is not None]
+        num_logged = sum(len(block) for block in log_features)
+        features = np.empty((num_logged + len(valid), 63), dtype=np.float32)
+        if log_features:
+            np.concatenate(log_features, out=features[:num_logged])
+        for row, i in enumerate(valid, start=num_logged):
+            features[row] = vectors[i]
+        labels = np.array(log_labels + [file_labels[i] for i in valid])
+        
+        print(f"Loaded {len(features)} samples for {len(set(labels))} letters")
+        return features, labels
+    
+    def augment_data(self, X, y):
+        """MINIMAL data augmentation for ASL - respects sign semantics
+        
+        Every sample is kept as-is (mirroring or rotating would change the
+        sign), so the arrays pass straight through without being copied.
+        """
+        return X, y
+
+    def preprocess_data(self, X, y):
+        """Enhanced preprocessing with normalization"""
+        # Normalize hand poses
+        X_normalized = self.normalize_hand_poses(X)
+        
+        # Apply data augmentation
+        X_augmented, y_augmented = self.augment_data(X_normalized, y)
+        
+        print(f"Data augmented from {len(X)} to {len(X_augmented)} samples")
+        
+        # Encode labels
+        if self.label_encoder is None:
+            self.label_encoder = LabelEncoder()
+            y_encoded = self.label_encoder.fit_transform(y_augmented)
+        else:
+            y_encoded = self.label_encoder.transform(y_augmented)
+        
+        # Scale features
+        if self.scaler is None:
+            self.scaler = StandardScaler()
+            X_scaled = self.scaler.fit_transform(X_augmented)
+        else:
+            X_scaled = self.scaler.transform(X_augmented)
+        
+        return X_scaled, y_encoded
+    
+    def build_model(self, input_shape, num_classes):
+        """Build neural network model - optimized for speed and accuracy"""
+        model = Sequential([
+            Dense(128, activation='relu', input_shape=(input_shape,)),
+            BatchNormalization(),
+            Dropout(0.3),
+            
+            Dense(64, activation='relu'),
+            BatchNormalization(),
+            Dropout(0.2),
+            
+            Dense(32, activation='relu'),
+            Dropout(0.2),
+            
+            Dense(num_classes, activation='softmax')
+        ])
+        
+        model.compile(
+            optimizer=Adam(learning_rate=0.001),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        return model
+    
+    def _prepare_inference(self):
+        """Cache scaler constants and the inference function after train/load"""
+        self._set_preprocessing(self.scaler.mean_, self.scaler.scale_, self.label_encoder.classes_)
+        
+        try:
+            self._publish_dense_layers(self._fold_dense_layers())
+        except ValueError as e:
+            print(f"⚠️ NumPy forward pass unavailable ({e}), using TensorFlow graph")
+            self._publish(self._build_inference_fn())
+    
+    def _fold_dense_layers(self):
+        """Flatten the scaler + Keras MLP into (W, b, activation) tuples.
+        
+        Dropout is a no-op at inference. The StandardScaler and every
+        BatchNormalization are affine transforms, so each is folded into the
+        weights of the Dense layer that follows it.
+        """
+        dense_layers = []
+        # The scaler, (x - mean) / scale, is the pending affine for the first Dense
+        inv_scale = 1.0 / self.scaler.scale_
+        bn_scale, bn_shift = inv_scale, -self.scaler.mean_ * inv_scale
+        
+        for layer in self.model.layers:
+            if isinstance(layer, Dropout):
+                continue
+            
+            if isinstance(layer, BatchNormalization):
+                gamma = layer.gamma.numpy() if layer.scale else 1.0
+                beta = layer.beta.numpy() if layer.center else 0.0
+                scale = gamma / np.sqrt(layer.moving_variance.numpy() + layer.epsilon)
+                shift = beta - layer.moving_mean.numpy() * scale
+                if bn_scale is None:
+                    bn_scale, bn_shift = scale, shift
+                else:
+                    bn_scale, bn_shift = bn_scale * scale, bn_shift * scale + shift
+                continue
+            
+            if not isinstance(layer, Dense):
+                raise ValueError(f"unsupported layer {layer.__class__.__name__}")
+            
+            activation = layer.get_config()["activation"]
+            if activation not in ("relu", "linear", "softmax"):
+                raise ValueError(f"unsupported activation {activation}")
+            
+            W, b = [w.astype(np.float64) for w in layer.get_weights()]
+            if bn_scale is not None:
+                # Dense(a * h + c) == (a[:, None] * W) h + (c @ W + b)
+                b = bn_shift @ W + b
+                W = W * bn_scale[:, None]
+                bn_scale = bn_shift = None
+            
+            dense_layers.append((
+                np.ascontiguousarray(W, dtype=np.float32),
+                np.ascontiguousarray(b, dtype=np.float32),
+                activation
+            ))
+        
+        if bn_scale is not None or not dense_layers:
+            raise ValueError("model must end with a Dense layer")
+        if dense_layers[-1][2] != "softmax" or any(act == "softmax" for _, _, act in dense_layers[:-1]):
+            raise ValueError("softmax is only supported on the output layer")
+        
+        return dense_layers
+    
+    def _build_inference_fn(self):
+        """Wrap the model in a traced graph function for fast inference, return it"""
+        model = self.model
+        graph_fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([None, 63], tf.float32)]
+        )
+        # Warm up so the first request doesn't pay for tracing
+        graph_fn(tf.constant(np.zeros((1, 63), dtype=np.float32)))
+        mean, inv_scale = self._mean, self._inv_scale
+        return lambda x: graph_fn(tf.constant((x - mean) * inv_scale)).numpy()
+    
+    def train(self, data_directory, test_size=0.2, epochs=100):
+        """Train the model"""
+        print("🚀 Starting ASL Landmark Model Training...")
+        
+        # Load data
+        X, y = self.load_dataset(data_directory)
+        
+        if len(X) == 0:
+            raise ValueError("No training data found!")
+        
+        print(f"Dataset: {len(X)} samples, {len(np.unique(y))} classes")
+        
+        # Preprocess
+        X_processed, y_processed = self.preprocess_data(X, y)
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_processed, y_processed, 
+            test_size=test_size, 
+            random_state=42, 
+            stratify=y_processed
+        )
+        
+        print(f"Train: {len(X_train)}, Test: {len(X_test)}")
+        
+        # Calculate class weights to handle imbalance
+        from sklearn.utils.class_weight import compute_class_weight
+        classes = np.unique(y_processed)
+        class_weights = compute_class_weight('balanced', classes=classes, y=y_processed)
+        class_weight_dict = {i: weight for i, weight in enumerate(class_weights)}
+        print(f"Using class weights to balance training data")
+        
+        # Build model
+        num_classes = len(np.unique(y_processed))
+        self.model = self.build_model(X_processed.shape[1], num_classes)
+        
+        print(f"Model built with {X_processed.shape[1]} features, {num_classes} classes")
+        
+        # Callbacks
+        callbacks = [
+            EarlyStopping(patience=15, restore_best_weights=True),
+            ModelCheckpoint('best_model.keras', save_best_only=True)
+        ]
+        
+        # Input pipeline: the whole set fits in memory, so stage it once and
+        # let tf.data prepare the next batch while the current one trains
+        train_ds = (
+            tf.data.Dataset.from_tensor_slices((X_train.astype(np.float32), y_train))
+            .shuffle(len(X_train))
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        val_ds = (
+            tf.data.Dataset.from_tensor_slices((X_test.astype(np.float32), y_test))
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        
+        # Train with class weights
+        history = self.model.fit(
+            train_ds,
+            validation_data=val_ds,
+            epochs=epochs,
+            class_weight=class_weight_dict,
+            callbacks=callbacks,
+            verbose=1
+        )
+        
+        # Evaluate
+        test_predictions = self.model.predict(X_test)
+        test_pred_classes = np.argmax(test_predictions, axis=1)
+        accuracy = accuracy_score(y_test, test_pred_classes)
+        
+        print(f"\n✅ Training Complete!")
+        print(f"Test Accuracy: {accuracy:.4f}")
+        print(f"Classes: {self.label_encoder.classes_}")
+        
+        self._prepare_inference()
+        self.is_trained = True
+        return {
+            "accuracy": accuracy,
+            "classes": self.label_encoder.classes_.tolist(),
+            "samples": len(X),
+            "features": X_processed.shape[1]
+        }
+    
+    def save_model(self, filepath):
+        """Save model and preprocessors"""
+        if self.model is None:
+            raise ValueError("No model to save")
+        
+        # Save model
+        self.model.save(f"{filepath}_model.keras")
+        self.export_inference(filepath)
+        
+        print(f"Model saved to {filepath}")
+    
+    def export_inference(self, filepath):
+        """Write the plain arrays landmark_runtime serves from, no TensorFlow needed"""
+        # Save preprocessors as plain arrays: no pickle, loads in a few ms
+        np.savez(
+            f"{filepath}_pp.npz",
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            classes=np.asarray(self.label_encoder.classes_)
+        )
+        
+        # Folded Dense layers as W0, b0, W1, b1, ... plus their activations
+        dense_layers = self._fold_dense_layers()
+        weights = {}
+        for i, (W, b, _) in enumerate(dense_layers):
+            weights[f"W{i}"] = W
+            weights[f"b{i}"] = b
+        np.savez(
+            f"{filepath}_weights.npz",
+            activations=np.array([activation for _, _, activation in dense_layers]),
+            **weights
+        )
+    
+    def _load_preprocessors(self, path):
+        """Rebuild the fitted label encoder and scaler from their saved arrays"""
+        with np.load(path, allow_pickle=False) as arrays:
+            mean = arrays["mean"]
+            scale = arrays["scale"]
+            classes = arrays["classes"]
+        
+        self.label_encoder = LabelEncoder()
+        self.label_encoder.classes_ = classes
+        
+        self.scaler = StandardScaler()
+        self.scaler.mean_ = mean
+        self.scaler.scale_ = scale
+        self.scaler.var_ = scale ** 2
+        self.scaler.n_features_in_ = mean.shape[0]
+    
+    def load_model(self, filepath):
+        """Load model and preprocessors"""
+        try:
+            # Try new format first with compatibility handling
+            if os.path.exists(f"{filepath}_model.keras"):
+                # Handle TensorFlow version compatibility issues
+                try:
+                    self.model = tf.keras.models.load_model(f"{filepath}_model.keras")
+                except Exception as keras_error:
+                    print(f"Keras format failed: {keras_error}")
+                    # Try loading with custom objects if needed
+                    return False
+            elif os.path.exists(f"{filepath}_model.h5"):
+                try:
+                    self.model = tf.keras.models.load_model(f"{filepath}_model.h5")
+                except Exception as h5_error:
+                    print(f"H5 format failed: {h5_error}")
+                    return False
+            else:
+                raise FileNotFoundError("No model file found")
+            
+            # Load preprocessors (fall back to the legacy pickle format)
+            if os.path.exists(f"{filepath}_pp.npz"):
+                self._load_preprocessors(f"{filepath}_pp.npz")
+            else:
+                with open(f"{filepath}_preprocessors.pkl", 'rb') as f:
+                    preprocessors = pickle.load(f)
+                    self.label_encoder = preprocessors['label_encoder']
+                    self.scaler = preprocessors['scaler']
+            
+            self._prepare_inference()
+            self.is_trained = True
+            print(f"Model loaded from {filepath}")
+            return True
+            
+        except Exception as e:
+            print(f"Failed to load model: {e}")
+            self.is_trained = False
+            self.model = None
+            self._state = None
+            return False
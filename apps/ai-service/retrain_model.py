@@ -16,17 +16,25 @@ This script will:
 """
 
 import os
-from landmark_model import ASLLandmarkModel
+import numpy as np
+from landmark_training import ASLLandmarkModel, SAMPLE_LOG_NAME, SAMPLE_DTYPE
 
 def count_samples_per_letter(data_directory):
     """Count samples for each letter to show data balance"""
     letters = {}
     
-    for letter_dir in os.listdir(data_directory):
-        letter_path = os.path.join(data_directory, letter_dir)
-        if os.path.isdir(letter_path) and len(letter_dir) == 1:
-            sample_count = len([f for f in os.listdir(letter_path) if f.endswith('.json')])
-            letters[letter_dir] = sample_count
+    # scandir yields cached d_type info, so no extra stat() per entry or list of names
+    with os.scandir(data_directory) as entries:
+        letter_dirs = [entry for entry in entries if len(entry.name) == 1 and entry.is_dir()]
+    
+    for letter_dir in letter_dirs:
+        with os.scandir(letter_dir.path) as files:
+            files = [f for f in files if f.is_file()]
+        
+        # Whole records in the binary log, plus one legacy JSON file per sample
+        log_records = sum(f.stat().st_size // SAMPLE_DTYPE.itemsize for f in files if f.name == SAMPLE_LOG_NAME)
+        json_samples = sum(1 for f in files if f.name.endswith('.json'))
+        letters[letter_dir.name] = log_records + json_samples
     
     return letters
 
@@ -82,7 +90,7 @@ def main():
         
         # Test the model with a simple prediction
         print(f"\n🧪 Testing model...")
-        test_landmarks = [[0.5, 0.5, 0.0] for _ in range(21)]
+        test_landmarks = np.full((21, 3), [0.5, 0.5, 0.0], dtype=np.float32)
         test_result = model.predict(test_landmarks)
         print(f"   Test prediction: {test_result}")
         
@@ -0,0 +1,44 @@
+import pickle
+from pathlib import Path
+import numpy as np
+import pytest
+from landmark_runtime import ASLLandmarkRuntime
+
+MODEL_PATH = Path(__file__).resolve().parent / "models" / "asl_landmark_model"
+
+_rng = np.random.default_rng(0)
+
+def load_preprocessors():
+    """Label encoder and scaler from the original pickle the .npz files were derived from"""
+    pytest.importorskip("sklearn")
+    with open(f"{MODEL_PATH}_preprocessors.pkl", "rb") as f:
+        preprocessors = pickle.load(f)
+    return preprocessors["label_encoder"], preprocessors["scaler"]
+
+def create_test_features(count: int) -> np.ndarray:
+    """Normalized (count, 63) features of random hands, as the runtime feeds the model"""
+    landmarks = _rng.uniform(low=[0.0, 0.0, -0.1], high=[1.0, 1.0, 0.1], size=(count, 21, 3))
+    return ASLLandmarkRuntime().normalize_hand_poses(landmarks.reshape(count, 63))
+
+def test_preprocessing_matches_pickle():
+    label_encoder, scaler = load_preprocessors()
+    with np.load(f"{MODEL_PATH}_pp.npz", allow_pickle=False) as arrays:
+        np.testing.assert_allclose(arrays["mean"], scaler.mean_, rtol=1e-6)
+        np.testing.assert_allclose(arrays["scale"], scaler.scale_, rtol=1e-6)
+        assert arrays["classes"].tolist() == label_encoder.classes_.tolist()
+
+def test_folded_weights_match_keras_model():
+    # Folding the scaler and BatchNorm into the Dense layers must not change the output
+    tf = pytest.importorskip("tensorflow")
+    label_encoder, scaler = load_preprocessors()
+    model = tf.keras.models.load_model(f"{MODEL_PATH}_model.keras")
+
+    runtime = ASLLandmarkRuntime()
+    assert runtime.load_model(str(MODEL_PATH))
+
+    X = create_test_features(256)
+    expected = model(scaler.transform(X).astype(np.float32), training=False).numpy()
+    infer = runtime._state[0]
+    actual = np.array(infer(X))  # copy out of the reused activation buffer
+
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
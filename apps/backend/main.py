@@ -1,15 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 import httpx
+import asyncio
 import os
-import json
+import time
+import orjson
+import msgspec
 import numpy as np
 from datetime import datetime
 import uuid
+import secrets
 from pathlib import Path
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl  # POSIX only; serializes appends to a sample log across workers
+except ImportError:
+    fcntl = None
 
 # Pydantic models
 class LandmarkPoint(BaseModel):
@@ -17,26 +29,28 @@ class LandmarkPoint(BaseModel):
     y: float
     z: float
 
-class LandmarkPredictionRequest(BaseModel):
-    landmarks: List[List[float]]  # [[x,y,z], [x,y,z], ...] - more efficient format
-
 class DataCollectionRequest(BaseModel):
     letter: str
     landmarks: List[List[float]]  # Updated to use array format
     timestamp: int
 
-class PredictionResponse(BaseModel):
-    prediction: str
-    confidence: float
-    landmarks: Optional[List[List[float]]] = None
-
 class HealthResponse(BaseModel):
     status: str
     message: str
     timestamp: str
 
-# Initialize FastAPI app
-app = FastAPI(title="SpellWithASL Backend", version="1.0.0")
+# Hot-path request bodies, decoded straight from JSON bytes by msgspec
+class LandmarkPredictionRequest(msgspec.Struct):
+    landmarks: List[List[float]]  # [[x,y,z], [x,y,z], ...] - more efficient format
+
+class LandmarkBatchPredictionRequest(msgspec.Struct):
+    landmarks_batch: List[List[List[float]]]  # one [[x,y,z], ...] entry per hand
+
+landmark_request_decoder = msgspec.json.Decoder(LandmarkPredictionRequest)
+landmark_batch_request_decoder = msgspec.json.Decoder(LandmarkBatchPredictionRequest)
+
+# Initialize FastAPI app; responses are serialized by orjson
+app = FastAPI(title="SpellWithASL Backend", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configure CORS - get allowed origins from environment
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,https://spell-with-asl.vercel.app").split(",")
@@ -49,11 +63,271 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shape contract for landmarks on every path: MediaPipe's 21 hand landmarks of
+# (x, y, z) as little-endian float32. Validated once against LANDMARK_SHAPE, then
+# handled as packed bytes (LANDMARKS_BINARY_SIZE = 252), never per element.
+LANDMARK_SHAPE = (21, 3)
+LANDMARK_DTYPE = np.dtype("<f4")
+LANDMARKS_BINARY_SIZE = LANDMARK_SHAPE[0] * LANDMARK_SHAPE[1] * LANDMARK_DTYPE.itemsize
+
 # Configuration
 AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "https://spell-with-asl-ai.up.railway.app")
 DATA_DIR = Path("training_data")
 DATA_DIR.mkdir(exist_ok=True)
 
+# New samples are appended to one binary log per letter instead of a JSON file
+# each: fixed-size records, so counting is a stat() and loading is one read
+# with no parsing. Older *.json samples are still read alongside the log.
+# The AI service reads the same layout; keep the two in sync.
+SAMPLE_LOG_NAME = "samples.bin"
+SAMPLE_DTYPE = np.dtype([
+    ("sample_id", "S36"),
+    ("timestamp", "<i8"),
+    ("landmarks", LANDMARK_DTYPE, LANDMARK_SHAPE),
+])
+
+def append_sample_records(letter_dir: Path, data: bytes, sync: bool = True) -> Path:
+    """Append whole records to a letter's sample log, then fsync unless `sync` is False.
+
+    Records must stay aligned to SAMPLE_DTYPE.itemsize, or every later one
+    decodes as garbage: a torn tail (crash mid-write) is trimmed before
+    appending, and a failed or short write is rolled back.
+    """
+    log_path = letter_dir / SAMPLE_LOG_NAME
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            # Hold other workers off between the size check and the write; close releases it
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        
+        size = os.fstat(fd).st_size
+        aligned_size = size - size % SAMPLE_DTYPE.itemsize
+        if aligned_size != size:
+            os.ftruncate(fd, aligned_size)
+        
+        try:
+            # os.write may write only part of the data (ENOSPC, signals); finish or undo
+            remaining = memoryview(data)
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+        except BaseException:
+            os.ftruncate(fd, aligned_size)
+            raise
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    return log_path
+
+def fsync_sample_log(log_path: Path):
+    """Flush a sample log's written records to disk"""
+    fd = os.open(log_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# Collected samples are written to their letter's log right away, so every
+# worker and the AI service read them at once; only the fsync is batched, once
+# per SAMPLE_SYNC_RECORDS samples or every SAMPLE_SYNC_MS, not per request
+SAMPLE_SYNC_RECORDS = int(os.getenv("SAMPLE_SYNC_RECORDS", "64"))
+SAMPLE_SYNC_MS = int(os.getenv("SAMPLE_SYNC_MS", "200"))
+_unsynced_samples = {}  # log path -> samples written since its last fsync
+
+async def sync_sample_logs(log_paths: Optional[List[Path]] = None):
+    """fsync logs with unsynced samples (all of them by default); failed ones stay pending"""
+    async def sync(log_path):
+        count = _unsynced_samples.pop(log_path, 0)
+        try:
+            await asyncio.to_thread(fsync_sample_log, log_path)
+        except Exception:
+            _unsynced_samples[log_path] = _unsynced_samples.get(log_path, 0) + count
+            raise
+    
+    paths = list(_unsynced_samples) if log_paths is None else log_paths
+    await asyncio.gather(*(sync(log_path) for log_path in paths))
+
+async def sync_sample_logs_periodically():
+    """Bound how long a collected sample can go without an fsync"""
+    while True:
+        await asyncio.sleep(SAMPLE_SYNC_MS / 1000)
+        try:
+            await sync_sample_logs()
+        except Exception as e:
+            print(f"Failed to sync collected samples: {e}")
+
+# Sample ids are drawn from a pool filled by one urandom read per SAMPLE_ID_BATCH
+# ids, not a syscall each. Filled lazily, so forked workers never share a pool.
+SAMPLE_ID_BATCH = 1024
+_sample_id_pool = deque()
+
+def new_sample_id() -> str:
+    """A random (version 4) UUID string, same format as str(uuid.uuid4())"""
+    if not _sample_id_pool:
+        random_bytes = secrets.token_bytes(16 * SAMPLE_ID_BATCH)
+        _sample_id_pool.extend(random_bytes[i:i + 16] for i in range(0, len(random_bytes), 16))
+    return str(uuid.UUID(bytes=_sample_id_pool.popleft(), version=4))
+
+def read_sample_log(letter_dir: Path, limit: Optional[int] = None) -> np.ndarray:
+    """Complete records in a letter's sample log, the first `limit` if given"""
+    try:
+        with open(letter_dir / SAMPLE_LOG_NAME, "rb") as f:
+            data = f.read() if limit is None else f.read(limit * SAMPLE_DTYPE.itemsize)
+    except FileNotFoundError:
+        return np.empty(0, dtype=SAMPLE_DTYPE)
+    # A torn trailing record (crash mid-write) is ignored
+    return np.frombuffer(data, dtype=SAMPLE_DTYPE, count=len(data) // SAMPLE_DTYPE.itemsize)
+
+def list_letter_dirs() -> List[Path]:
+    """Letter directories under DATA_DIR; scandir gets the type from readdir, no stat() each"""
+    with os.scandir(DATA_DIR) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False)]
+
+def list_json_samples(letter_dir: Path) -> List[str]:
+    """Paths of the legacy per-sample JSON files in a letter directory"""
+    with os.scandir(letter_dir) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+        ]
+
+# /export-dataset reads every sample file; size its pool for I/O, not CPU
+_export_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="export")
+# Letters loaded ahead of the one being streamed; bounds export memory to a few letters
+EXPORT_PREFETCH_LETTERS = 4
+
+# Per-letter results memoized on letter_dir_version(); letter -> (version, result)
+_SAMPLE_COUNT_CACHE = {}
+_LETTER_ANALYSIS_CACHE = {}
+
+def letter_dir_version(letter_dir: Path) -> tuple:
+    """Changes whenever a letter's samples do: adding or removing a JSON file bumps
+    the directory mtime, and appending to the log grows it"""
+    try:
+        log_size = (letter_dir / SAMPLE_LOG_NAME).stat().st_size
+    except FileNotFoundError:
+        log_size = 0
+    return (letter_dir.stat().st_mtime_ns, log_size)
+
+def letter_sample_count(letter_dir: Path) -> int:
+    """Number of samples for a letter, recounted only when the letter directory changes"""
+    version = letter_dir_version(letter_dir)
+    cached = _SAMPLE_COUNT_CACHE.get(letter_dir.name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    count = len(list_json_samples(letter_dir)) + version[1] // SAMPLE_DTYPE.itemsize
+    _SAMPLE_COUNT_CACHE[letter_dir.name] = (version, count)
+    return count
+
+def analyze_letter_dir(letter_dir: Path) -> tuple:
+    """(sample count, quality issues) for one letter, memoized like letter_sample_count"""
+    version = letter_dir_version(letter_dir)
+    cached = _LETTER_ANALYSIS_CACHE.get(letter_dir.name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    letter = letter_dir.name
+    issues = []
+    sample_files = list_json_samples(letter_dir)
+    log_count = version[1] // SAMPLE_DTYPE.itemsize
+    count = len(sample_files) + log_count
+    
+    # Analyze sample quality for this letter
+    if count > 0:
+        # Sample a few files to check data quality
+        try:
+            if log_count > 0:
+                # Log records always hold exactly 21 landmarks
+                landmarks = read_sample_log(letter_dir, limit=1)[0]["landmarks"]
+            else:
+                with open(sample_files[0], "rb") as f:
+                    sample = orjson.loads(f.read())
+                
+                landmark_dicts = sample["landmarks"]
+                if len(landmark_dicts) != 21:
+                    issues.append(
+                        f"Letter {letter}: Invalid landmark count ({len(landmark_dicts)} instead of 21)"
+                    )
+                landmarks = np.fromiter(
+                    (c for lm in landmark_dicts for c in (lm["x"], lm["y"], lm["z"])),
+                    dtype=np.float32,
+                    count=len(landmark_dicts) * 3
+                ).reshape(-1, 3)
+            
+            # Check for reasonable coordinate ranges (one NumPy reduction, not Python max/min)
+            x_range = float(np.ptp(landmarks[:, 0]))
+            if x_range < 0.1:
+                issues.append(
+                    f"Letter {letter}: Hand appears too small (x-range: {x_range:.3f})"
+                )
+                
+        except Exception as e:
+            issues.append(f"Letter {letter}: Data parsing error - {str(e)}")
+    
+    _LETTER_ANALYSIS_CACHE[letter] = (version, (count, issues))
+    return count, issues
+
+def export_letter_samples(letter_dir: Path) -> list:
+    """All samples of one letter in the flat training format used by /export-dataset"""
+    letter = letter_dir.name
+    dataset = []
+    
+    # Whole letter's log as one (N, 63) block: a single tolist() instead of one per record
+    records = read_sample_log(letter_dir)
+    for sample_id, landmarks_flat in zip(records["sample_id"].tolist(), records["landmarks"].reshape(-1, 63).tolist()):
+        dataset.append({
+            "letter": letter,
+            "landmarks": landmarks_flat,  # 63 features
+            "sample_id": sample_id.decode()
+        })
+    
+    for sample_file in list_json_samples(letter_dir):
+        # /export-dataset is streamed, so an exception here would cut its JSON short
+        # after a 200; skip unreadable samples instead
+        try:
+            with open(sample_file, "rb") as f:
+                sample = orjson.loads(f.read())
+            
+            # Convert to training format in one pass (keeps the stored float64 values exactly)
+            landmarks_flat = [c for lm in sample["landmarks"] for c in (lm["x"], lm["y"], lm["z"])]
+            sample_id = sample["sample_id"]
+        except Exception as e:
+            print(f"Skipping unreadable sample {sample_file}: {e}")
+            continue
+        
+        dataset.append({
+            "letter": letter,
+            "landmarks": landmarks_flat,  # 63 features (21 landmarks * 3 coordinates)
+            "sample_id": sample_id
+        })
+    
+    return dataset
+
+# One pooled client for all calls to the AI service, so requests reuse warm
+# keep-alive (and, over TLS, HTTP/2) connections instead of a handshake each
+@app.on_event("startup")
+async def open_ai_client():
+    app.state.ai_client = httpx.AsyncClient(
+        base_url=AI_SERVICE_URL,
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True
+    )
+
+@app.on_event("shutdown")
+async def close_ai_client():
+    await app.state.ai_client.aclose()
+
+@app.on_event("startup")
+async def start_sample_sync():
+    app.state.sample_sync_task = asyncio.create_task(sync_sample_logs_periodically())
+
+@app.on_event("shutdown")
+async def stop_sample_sync():
+    app.state.sample_sync_task.cancel()
+    await sync_sample_logs()
+
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -63,69 +337,207 @@ async def health_check():
         timestamp=datetime.now().isoformat()
     )
 
+def landmarks_array(landmarks: list) -> np.ndarray:
+    """Validated LANDMARK_SHAPE array of request landmarks, or a 400"""
+    try:
+        array = np.asarray(landmarks, dtype=LANDMARK_DTYPE)
+    except (ValueError, TypeError):
+        # Ragged lists, e.g. [[1, 2], [1, 2, 3]]
+        raise HTTPException(status_code=400, detail="Expected 21 landmarks of [x, y, z]")
+    if array.shape != LANDMARK_SHAPE:
+        raise HTTPException(status_code=400, detail=f"Expected 21 landmarks of [x, y, z], got shape {array.shape}")
+    # NaN, inf, or values beyond float32 range (which become inf above)
+    if not np.isfinite(array).all():
+        raise HTTPException(status_code=400, detail="Landmark coordinates must be finite numbers")
+    return array
+
+# Landmarks travel to the AI service as the packed LANDMARKS_BINARY_SIZE bytes
+# instead of nested JSON lists
+async def forward_landmarks_binary(body: bytes) -> dict:
+    """Send packed landmarks to the AI service's binary endpoint and return its result"""
+    response = await app.state.ai_client.post(
+        "/predict-landmarks/bin",
+        content=body,
+        # prediction_response only keeps prediction/confidence: skip top_predictions
+        params={"debug": "0"},
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"AI service error: {response.text}"
+        )
+    return response.json()
+
+# Held signs send near-identical frames: recent AI service results are reused
+# for landmarks equal to 1/PREDICTION_CACHE_QUANTIZATION. Entries expire after
+# PREDICTION_CACHE_TTL seconds, so a retrain this worker didn't trigger (another
+# worker, or directly on the AI service) is picked up; /train-model also clears.
+PREDICTION_CACHE_SIZE = 4096
+PREDICTION_CACHE_QUANTIZATION = 1000
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", 30))
+_prediction_cache = OrderedDict()  # key -> (expires_at, result)
+
+def prediction_cache_key(body: bytes) -> bytes:
+    """Packed landmarks quantized to int16, so nearly identical hands share a key"""
+    assert len(body) == LANDMARKS_BINARY_SIZE
+    landmarks = np.frombuffer(body, dtype=LANDMARK_DTYPE)
+    quantized = np.rint(landmarks * PREDICTION_CACHE_QUANTIZATION)
+    return np.clip(quantized, -32768, 32767).astype(np.int16).tobytes()
+
+async def predict_landmarks_cached(body: bytes) -> dict:
+    """forward_landmarks_binary behind a small LRU of recent predictions"""
+    key = prediction_cache_key(body)
+    now = time.monotonic()
+    cached = _prediction_cache.get(key)
+    if cached is not None:
+        if cached[0] > now:
+            _prediction_cache.move_to_end(key)
+            return cached[1]
+        del _prediction_cache[key]
+    
+    result = await forward_landmarks_binary(body)
+    # Errors ("model not trained", ...) are transient; only cache real predictions
+    if result.get("prediction") is not None and "error" not in result:
+        _prediction_cache[key] = (now + PREDICTION_CACHE_TTL, result)
+        if len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+            _prediction_cache.popitem(last=False)
+    return result
+
+def prediction_response(result: dict, landmarks: Optional[list] = None) -> dict:
+    """Response body for an AI service prediction, keeping its error for the frontend"""
+    response = {
+        "prediction": result.get("prediction", "Unknown"),
+        "confidence": result.get("confidence", 0.0),
+        "landmarks": landmarks
+    }
+    # e.g. "Model not trained": the frontend shows result.error
+    if "error" in result:
+        response["error"] = result["error"]
+    return response
+
 # Landmark-based prediction
-@app.post("/predict-landmarks", response_model=PredictionResponse)
-async def predict_asl_landmarks(request: LandmarkPredictionRequest):
+# Hot endpoints return plain dicts: no response model to build and re-validate
+@app.post("/predict-landmarks")
+async def predict_asl_landmarks(raw_request: Request):
     """Predict ASL letter from MediaPipe landmarks"""
     try:
-        # Call AI service with landmarks (already in correct format)
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AI_SERVICE_URL}/predict-landmarks",
-                json={"landmarks": request.landmarks},
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return PredictionResponse(
-                    prediction=result.get("prediction", "Unknown"),
-                    confidence=result.get("confidence", 0.0),
-                    landmarks=request.landmarks
-                )
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"AI service error: {response.text}"
-                )
+        request = landmark_request_decoder.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {e}")
+    
+    # msgspec already built the lists in C; one more C call makes the array
+    landmarks = landmarks_array(request.landmarks)
+    
+    try:
+        # Pack once and forward as binary, skipping a JSON encode + decode
+        result = await predict_landmarks_cached(landmarks.tobytes())
+        return prediction_response(result, request.landmarks)
                 
     except httpx.TimeoutException:
         raise HTTPException(status_code=408, detail="AI service timeout")
+    except HTTPException:
+        # Keep the AI service's status (e.g. 422, 409) rather than turning it into a 500
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@app.post("/predict-landmarks/bin")
+async def predict_asl_landmarks_binary(raw_request: Request):
+    """Predict ASL letter from a raw 252-byte body of 21 x (x, y, z) float32 landmarks"""
+    body = await raw_request.body()
+    if len(body) != LANDMARKS_BINARY_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Expected {LANDMARKS_BINARY_SIZE} bytes (21 x 3 float32), got {len(body)}"
+        )
+    landmarks = np.frombuffer(body, dtype=LANDMARK_DTYPE)
+    if not np.isfinite(landmarks).all():
+        raise HTTPException(status_code=400, detail="Landmark coordinates must be finite numbers")
+    
+    try:
+        # Forwarded verbatim: no parsing or re-encoding in the backend
+        result = await predict_landmarks_cached(body)
+        return prediction_response(result)
+        
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=408, detail="AI service timeout")
+    except HTTPException:
+        # Keep the AI service's status (e.g. 422, 409) rather than turning it into a 500
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict-landmarks/batch")
+async def predict_asl_landmarks_batch(raw_request: Request):
+    """Predict ASL letters for many hands with one call to the AI service"""
+    body = await raw_request.body()
+    try:
+        # Validate only; the AI service takes the same JSON, so the body is forwarded as-is
+        landmark_batch_request_decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {e}")
+    
+    try:
+        # One request and one vectorized model call, not N round-trips
+        response = await app.state.ai_client.post(
+            "/predict-landmarks/batch",
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"AI service error: {response.text}"
+            )
+        
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=408, detail="AI service timeout")
+    except HTTPException:
+        # Keep the AI service's status (e.g. 422, 409) rather than turning it into a 500
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 # Data collection endpoint
 @app.post("/collect-sample")
 async def collect_training_sample(request: DataCollectionRequest):
     """Collect landmark data for training"""
+    landmarks = landmarks_array(request.landmarks)
+    
     try:
         # Create letter directory if it doesn't exist
         letter_dir = DATA_DIR / request.letter
         letter_dir.mkdir(exist_ok=True)
         
-        # Create unique filename
-        sample_id = str(uuid.uuid4())
-        filename = letter_dir / f"{sample_id}.json"
-        
-        # Prepare sample data (convert to object format for consistency with existing data)
-        landmarks_objects = [{"x": lm[0], "y": lm[1], "z": lm[2]} for lm in request.landmarks]
+        # Create unique sample id
+        sample_id = new_sample_id()
         
-        sample_data = {
-            "letter": request.letter,
-            "landmarks": landmarks_objects,
-            "timestamp": request.timestamp,
-            "sample_id": sample_id
-        }
+        # Pack the sample into one fixed-size record (252 bytes of landmarks vs ~2 KB of JSON)
+        record = np.zeros(1, dtype=SAMPLE_DTYPE)
+        record["sample_id"] = sample_id
+        record["timestamp"] = request.timestamp
+        record["landmarks"] = landmarks
         
-        # Save to file
-        with open(filename, 'w') as f:
-            json.dump(sample_data, f, indent=2)
+        # Append to the letter's log now; fsync once a batch of samples is pending
+        log_path = await asyncio.to_thread(append_sample_records, letter_dir, record.tobytes(), False)
+        _unsynced_samples[log_path] = _unsynced_samples.get(log_path, 0) + 1
+        if _unsynced_samples[log_path] >= SAMPLE_SYNC_RECORDS:
+            try:
+                await sync_sample_logs([log_path])
+            except Exception as e:
+                # The sample is written; the periodic sync retries the fsync
+                print(f"Failed to sync collected samples: {e}")
         
         return {
             "success": True,
             "message": f"Sample collected for letter {request.letter}",
             "sample_id": sample_id,
-            "filename": str(filename)
+            "filename": str(log_path)
         }
         
     except Exception as e:
@@ -139,13 +551,15 @@ async def get_collection_stats():
         stats = {}
         total_samples = 0
         
-        # Count samples for each letter
-        for letter_dir in DATA_DIR.iterdir():
-            if letter_dir.is_dir():
-                letter = letter_dir.name
-                sample_count = len(list(letter_dir.glob("*.json")))
-                stats[letter] = sample_count
-                total_samples += sample_count
+        # Count samples for each letter, letters in parallel off the event loop
+        letter_dirs = await asyncio.to_thread(list_letter_dirs)
+        sample_counts = await asyncio.gather(
+            *(asyncio.to_thread(letter_sample_count, letter_dir) for letter_dir in letter_dirs)
+        )
+        for letter_dir, sample_count in zip(letter_dirs, sample_counts):
+            letter = letter_dir.name
+            stats[letter] = sample_count
+            total_samples += sample_count
         
         return {
             "total_samples": total_samples,
@@ -177,40 +591,16 @@ async def analyze_training_data():
         total_samples = 0
         letter_counts = {}
         
-        # Analyze each letter
-        for letter_dir in DATA_DIR.iterdir():
-            if letter_dir.is_dir():
-                letter = letter_dir.name
-                sample_files = list(letter_dir.glob("*.json"))
-                count = len(sample_files)
-                letter_counts[letter] = count
-                total_samples += count
-                
-                # Analyze sample quality for this letter
-                if count > 0:
-                    # Sample a few files to check data quality
-                    sample_file = sample_files[0]
-                    try:
-                        with open(sample_file, 'r') as f:
-                            sample = json.load(f)
-                        
-                        landmarks = sample["landmarks"]
-                        if len(landmarks) != 21:
-                            analysis["potential_issues"].append(
-                                f"Letter {letter}: Invalid landmark count ({len(landmarks)} instead of 21)"
-                            )
-                            
-                        # Check for reasonable coordinate ranges
-                        x_coords = [lm["x"] for lm in landmarks]
-                        y_coords = [lm["y"] for lm in landmarks]
-                        
-                        if max(x_coords) - min(x_coords) < 0.1:
-                            analysis["potential_issues"].append(
-                                f"Letter {letter}: Hand appears too small (x-range: {max(x_coords) - min(x_coords):.3f})"
-                            )
-                            
-                    except Exception as e:
-                        analysis["potential_issues"].append(f"Letter {letter}: Data parsing error - {str(e)}")
+        # Analyze each letter, letters in parallel off the event loop
+        letter_dirs = await asyncio.to_thread(list_letter_dirs)
+        letter_results = await asyncio.gather(
+            *(asyncio.to_thread(analyze_letter_dir, letter_dir) for letter_dir in letter_dirs)
+        )
+        for letter_dir, (count, issues) in zip(letter_dirs, letter_results):
+            letter = letter_dir.name
+            letter_counts[letter] = count
+            total_samples += count
+            analysis["potential_issues"].extend(issues)
         
         analysis["letter_distribution"] = letter_counts
         
@@ -245,67 +635,91 @@ async def analyze_training_data():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+async def stream_export(letter_dirs: List[Path]):
+    """Yield the /export-dataset JSON one letter at a time, loading a few letters ahead"""
+    loop = asyncio.get_running_loop()
+    remaining = iter(letter_dirs)
+    pending = deque()
+    
+    def load_next_letter():
+        letter_dir = next(remaining, None)
+        if letter_dir is not None:
+            pending.append(loop.run_in_executor(_export_pool, export_letter_samples, letter_dir))
+    
+    for _ in range(EXPORT_PREFETCH_LETTERS):
+        load_next_letter()
+    
+    total_samples = 0
+    yield b'{"dataset":['
+    while pending:
+        letter_load = pending.popleft()
+        load_next_letter()
+        try:
+            samples = await letter_load
+        except Exception as e:
+            # Headers are already sent; keep the document valid and leave the letter out
+            print(f"Skipping letter in export: {e}")
+            continue
+        if samples:
+            # orjson encodes the letter's list in one call; strip its brackets to splice it in
+            yield (b"," if total_samples else b"") + orjson.dumps(samples)[1:-1]
+            total_samples += len(samples)
+    
+    # 63 features = 21 landmarks * 3 coordinates
+    yield b'],"total_samples":%d,"feature_count":63,"format":"landmarks_flat"}' % total_samples
+
 # Export training data
 @app.get("/export-dataset")
 async def export_training_dataset():
-    """Export collected data in training format"""
+    """Export collected data in training format, streamed instead of built in memory"""
     try:
-        dataset = []
-        
-        # Load all samples
-        for letter_dir in DATA_DIR.iterdir():
-            if letter_dir.is_dir():
-                letter = letter_dir.name
-                for sample_file in letter_dir.glob("*.json"):
-                    with open(sample_file, 'r') as f:
-                        sample = json.load(f)
-                        
-                        # Convert to training format
-                        landmarks_flat = []
-                        for landmark in sample["landmarks"]:
-                            landmarks_flat.extend([landmark["x"], landmark["y"], landmark["z"]])
-                        
-                        dataset.append({
-                            "letter": letter,
-                            "landmarks": landmarks_flat,  # 63 features (21 landmarks * 3 coordinates)
-                            "sample_id": sample["sample_id"]
-                        })
-        
-        return {
-            "dataset": dataset,
-            "total_samples": len(dataset),
-            "feature_count": 63,  # 21 landmarks * 3 coordinates
-            "format": "landmarks_flat"
-        }
-        
+        letter_dirs = await asyncio.to_thread(list_letter_dirs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export dataset: {str(e)}")
+    
+    return StreamingResponse(stream_export(letter_dirs), media_type="application/json")
 
 # Trigger model training
 @app.post("/train-model")
 async def trigger_model_training():
     """Trigger training of the landmark-based model"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{AI_SERVICE_URL}/train-landmarks",
-                json={"data_directory": str(DATA_DIR)},
-                timeout=300.0  # 5 minutes timeout for training
+        response = await app.state.ai_client.post(
+            "/train-landmarks",
+            json={"data_directory": str(DATA_DIR)},
+            timeout=300.0  # 5 minutes timeout for training
+        )
+        
+        if response.status_code == 200:
+            # Cached predictions came from the old model
+            _prediction_cache.clear()
+            return response.json()
+        else:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Training failed: {response.text}"
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Training failed: {response.text}"
-                )
                 
     except httpx.TimeoutException:
+        # Training may still finish and swap the model in
+        _prediction_cache.clear()
         raise HTTPException(status_code=408, detail="Training timeout")
+    except HTTPException:
+        # Keep the AI service's status (e.g. 422, 409) rather than turning it into a 500
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Training failed: {str(e)}")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Auto-reload only in development; otherwise scale out with worker processes
+    dev_mode = os.getenv("DEV") == "1"
+    workers = None if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        reload=dev_mode,
+        workers=workers,
+        log_level="info"
+    )
\ No newline at end of file
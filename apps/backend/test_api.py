@@ -1,72 +1,157 @@
 import pytest
+import pytest_asyncio
 import httpx
 import asyncio
-import random
+import shutil
+import uuid
+from pathlib import Path
+import numpy as np
+from main import DATA_DIR, SAMPLE_LOG_NAME, SAMPLE_DTYPE
 
 BASE_URL = "http://localhost:8000"
+# The server resolves DATA_DIR against apps/backend, where it is started
+BACKEND_DIR = Path(__file__).resolve().parent
+
+_rng = np.random.default_rng()
+
+def make_client() -> httpx.AsyncClient:
+    """One pooled keep-alive client, shared by every test instead of a connection each"""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    )
 
 def create_test_landmarks() -> list[list[float]]:
     """Create test landmark data (21 points with x,y,z coordinates)"""
-    landmarks = []
-    for _ in range(21):  # MediaPipe returns 21 hand landmarks
-        landmarks.append([
-            random.uniform(0.0, 1.0),  # x coordinate
-            random.uniform(0.0, 1.0),  # y coordinate
-            random.uniform(-0.1, 0.1)  # z coordinate (depth)
-        ])
-    return landmarks
+    # MediaPipe returns 21 hand landmarks; draw them all in one vectorized call
+    landmarks = _rng.uniform(
+        low=[0.0, 0.0, -0.1],   # x, y, z (depth)
+        high=[1.0, 1.0, 0.1],
+        size=(21, 3)
+    )
+    return landmarks.tolist()
+
+@pytest.fixture(scope="module")
+def event_loop():
+    # Module-wide loop so the shared client's pooled connections outlive each test
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="module")
+async def client():
+    async with make_client() as client:
+        yield client
 
 @pytest.mark.asyncio
-async def test_health_endpoint():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] in ["healthy", "degraded"]
+async def test_health_endpoint(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] in ["healthy", "degraded"]
 
 @pytest.mark.asyncio
-async def test_predict_landmarks_endpoint():
+async def test_predict_landmarks_endpoint(client):
     test_landmarks = create_test_landmarks()
     
-    async with httpx.AsyncClient() as client:
+    response = await client.post(
+        "/predict-landmarks",
+        json={"landmarks": test_landmarks}
+    )
+    # The response might be 200 (success) or 500 (if AI service unavailable)
+    # Both are valid for testing purposes
+    assert response.status_code in [200, 500]
+    
+    data = response.json()
+    if response.status_code == 200:
+        assert "prediction" in data
+        assert "confidence" in data
+        assert 0.0 <= data["confidence"] <= 1.0
+    else:
+        # If AI service is unavailable, expect error detail
+        assert "detail" in data
+
+@pytest.mark.asyncio
+async def test_collection_stats_endpoint(client):
+    response = await client.get("/collection-stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "total_samples" in data
+    assert "letter_stats" in data
+    assert isinstance(data["total_samples"], int)
+
+@pytest.mark.asyncio
+async def test_predict_landmarks_binary_rejects_wrong_size(client):
+    body = np.zeros((21, 3), dtype="<f4").tobytes()[:-4]
+    response = await client.post(
+        "/predict-landmarks/bin",
+        content=body,
+        headers={"Content-Type": "application/octet-stream"}
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_predict_landmarks_binary_rejects_non_finite(client):
+    for bad_value in (np.nan, np.inf):
+        landmarks = np.asarray(create_test_landmarks(), dtype="<f4")
+        landmarks[5, 1] = bad_value
         response = await client.post(
-            f"{BASE_URL}/predict-landmarks",
-            json={"landmarks": test_landmarks}
+            "/predict-landmarks/bin",
+            content=landmarks.tobytes(),
+            headers={"Content-Type": "application/octet-stream"}
         )
-        # The response might be 200 (success) or 500 (if AI service unavailable)
-        # Both are valid for testing purposes
-        assert response.status_code in [200, 500]
-        
-        data = response.json()
-        if response.status_code == 200:
-            assert "prediction" in data
-            assert "confidence" in data
-            assert 0.0 <= data["confidence"] <= 1.0
-        else:
-            # If AI service is unavailable, expect error detail
-            assert "detail" in data
+        assert response.status_code == 400
 
 @pytest.mark.asyncio
-async def test_collection_stats_endpoint():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/collection-stats")
+async def test_collect_sample_round_trip(client):
+    # Reads the server's sample log directly; any worker's collect is in it at once
+    letter = f"test_{uuid.uuid4().hex[:8]}"
+    letter_dir = BACKEND_DIR / DATA_DIR / letter
+    try:
+        sample_ids = []
+        for timestamp in range(3):
+            response = await client.post(
+                "/collect-sample",
+                json={"letter": letter, "landmarks": create_test_landmarks(), "timestamp": timestamp}
+            )
+            assert response.status_code == 200
+            sample_ids.append(response.json()["sample_id"])
+        
+        response = await client.get("/collection-stats")
+        assert response.status_code == 200
+        assert response.json()["letter_stats"][letter] == 3
+        
+        records = np.fromfile(letter_dir / SAMPLE_LOG_NAME, dtype=SAMPLE_DTYPE)
+        assert len(records) == 3
+        assert sorted(sample_id.decode() for sample_id in records["sample_id"]) == sorted(sample_ids)
+        
+        response = await client.get("/export-dataset")
         assert response.status_code == 200
         data = response.json()
-        assert "total_samples" in data
-        assert "letter_stats" in data
-        assert isinstance(data["total_samples"], int)
+        exported = [sample for sample in data["dataset"] if sample["letter"] == letter]
+        assert sorted(sample["sample_id"] for sample in exported) == sorted(sample_ids)
+        assert all(len(sample["landmarks"]) == 63 for sample in exported)
+        assert data["total_samples"] == len(data["dataset"])
+    finally:
+        shutil.rmtree(letter_dir, ignore_errors=True)
 
 if __name__ == "__main__":
     # Run tests
     async def run_tests():
-        await test_health_endpoint()
-        print("✅ Health endpoint test passed")
-        
-        await test_predict_landmarks_endpoint()
-        print("✅ Predict landmarks endpoint test passed")
+        async def run(test, name):
+            await test(client)
+            print(f"✅ {name} endpoint test passed")
         
-        await test_collection_stats_endpoint()
-        print("✅ Collection stats endpoint test passed")
+        # The endpoint tests are independent, so run them concurrently
+        async with make_client() as client:
+            await asyncio.gather(
+                run(test_health_endpoint, "Health"),
+                run(test_predict_landmarks_endpoint, "Predict landmarks"),
+                run(test_collection_stats_endpoint, "Collection stats"),
+                run(test_predict_landmarks_binary_rejects_wrong_size, "Binary predict size check"),
+                run(test_predict_landmarks_binary_rejects_non_finite, "Binary predict finite check"),
+                run(test_collect_sample_round_trip, "Collect/stats/export round trip")
+            )
         
         print("🎉 All tests completed!")
     
@@ -38,10 +38,16 @@ export class ASLAPIService {
         };
       }
 
-      const response = await fetch(`${this.baseURL}/predict-landmarks`, {
+      // Pack as 21 x (x, y, z) float32: a 252-byte body the backend forwards
+      // verbatim, instead of JSON text. Typed arrays use the platform byte
+      // order, which is little-endian on every browser platform.
+      const packed = new Float32Array(63);
+      landmarks.forEach((landmark, i) => packed.set(landmark, i * 3));
+
+      const response = await fetch(`${this.baseURL}/predict-landmarks/bin`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ landmarks }),
+        headers: { 'Content-Type': 'application/octet-stream' },
+        body: packed,
         // Reasonable timeout for real-time feel
         signal: AbortSignal.timeout(5000) // 5 seconds max
       });
@@ -8,6 +8,27 @@ export interface HandLandmarks {
 // Global instance counter to prevent multiple MediaPipe instances
 let instanceCount = 0;
 
+// One MediaPipe Hands graph per page load: creating it downloads the model and
+// boots the WASM runtime, so trackers, retries and page visits all share it
+let sharedHands: Hands | null = null;
+
+export function getSharedHands(): Hands {
+  if (!sharedHands) {
+    sharedHands = new Hands({
+      locateFile: (file) => `https://cdn.jsdelivr.net/npm/@mediapipe/hands/${file}`,
+    });
+
+    sharedHands.setOptions({
+      maxNumHands: 1,
+      modelComplexity: 0, // Reduced complexity for stability
+      minDetectionConfidence: 0.7,
+      minTrackingConfidence: 0.5,
+      selfieMode: true
+    });
+  }
+  return sharedHands;
+}
+
 export class MediaPipeHandTracker {
   private hands: Hands | null = null;
   private camera: Camera | null = null;
@@ -39,23 +60,11 @@ export class MediaPipeHandTracker {
     try {
       console.log(`Initializing MediaPipe instance ${this.instanceId}...`);
       
-      // Initialize MediaPipe Hands with error handling
+      // Attach to the shared MediaPipe Hands; its results now go to this tracker
       if (!this.hands) {
-        console.log(`Creating MediaPipe Hands for instance ${this.instanceId}...`);
-        this.hands = new Hands({
-          locateFile: (file) => `https://cdn.jsdelivr.net/npm/@mediapipe/hands/${file}`,
-        });
-
-        this.hands.setOptions({
-          maxNumHands: 1,
-          modelComplexity: 0, // Reduced complexity for stability
-          minDetectionConfidence: 0.7,
-          minTrackingConfidence: 0.5,
-          selfieMode: true
-        });
-
+        this.hands = getSharedHands();
         this.hands.onResults(this.onResults);
-        console.log(`MediaPipe Hands created for instance ${this.instanceId}`);
+        console.log(`MediaPipe Hands attached to instance ${this.instanceId}`);
       }
 
       // Get camera stream
@@ -6,6 +6,7 @@ import { Hands, Results } from '@mediapipe/hands';
 import { drawConnectors, drawLandmarks } from '@mediapipe/drawing_utils';
 import { HAND_CONNECTIONS } from '@mediapipe/hands';
 import { apiService } from '../lib/api';
+import { getSharedHands } from '../lib/mediapipe-hands';
 
 const PracticeEnhancedPage: React.FC = () => {
   const router = useRouter();
@@ -277,18 +278,8 @@ const PracticeEnhancedPage: React.FC = () => {
           stream = null;
         }
 
-        // Create MediaPipe Hands with error handling
-        const hands = new Hands({
-          locateFile: (file) => `https://cdn.jsdelivr.net/npm/@mediapipe/hands/${file}`,
-        });
-        
-        hands.setOptions({
-          maxNumHands: 1,
-          modelComplexity: 0,
-          minDetectionConfidence: 0.7,
-          minTrackingConfidence: 0.5,
-          selfieMode: true
-        });
+        // Reuse the page-wide MediaPipe Hands instead of building a new graph per attempt
+        const hands = getSharedHands();
         
         // Results handler with better error checking
         hands.onResults((results: Results) => {
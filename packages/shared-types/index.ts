@@ -62,6 +62,8 @@ export interface UserSession {
 // API endpoint types
 export const API_ENDPOINTS = {
   PREDICT_LANDMARKS: '/predict-landmarks',
+  PREDICT_LANDMARKS_BINARY: '/predict-landmarks/bin', // body: 21 x (x, y, z) float32
+  PREDICT_LANDMARKS_BATCH: '/predict-landmarks/batch',
   HEALTH: '/health',
   COLLECT_SAMPLE: '/collect-sample',
   COLLECTION_STATS: '/collection-stats',